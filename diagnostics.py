@@ -0,0 +1,296 @@
+from __future__ import annotations
+import cProfile
+import functools
+import io
+import os
+import pstats
+import sys
+import threading
+import time
+import traceback
+import tracemalloc
+from collections import deque
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+
+from PySide6.QtCore import QObject, QTimer
+
+from utils import DIAG_HANG_SECONDS, DIAG_HEARTBEAT_MS, DIAG_STALL_MS, DIAGNOSTICS_DIR
+
+def env_flag(name: str) -> bool:
+    return os.environ.get(name, "").strip().lower() in ("1", "true", "yes", "on")
+
+# from 3.12 cProfile sits on sys.monitoring, which sees every thread, so per-thread profiles would mix threads
+PROCESS_WIDE_PROFILER = sys.version_info >= (3, 12)
+
+def default_report_path() -> str:
+    return os.path.join(DIAGNOSTICS_DIR, f"diagnostics-{datetime.now().strftime('%Y%m%d-%H%M%S')}.txt")
+
+class DiagnosticsMonitor(QObject):
+    """Measures GUI event-loop latency and records stalls with the slot that was running.
+
+    A heartbeat QTimer measures how late each tick fires. A watchdog thread notices
+    overdue heartbeats while the stall is still happening and samples the stacks of
+    all threads, so worker threads holding the GIL show up next to the GUI thread.
+    Instrumented slots record call counts and time, and name the slot on each stall.
+    With profile=True, tracemalloc is on and cProfile runs per worker thread, or once
+    for the whole process on Python 3.12+.
+    """
+
+    def __init__(self, report_path: str, profile: bool = False,
+                 heartbeat_ms: int = DIAG_HEARTBEAT_MS, stall_ms: int = DIAG_STALL_MS, parent=None):
+        super().__init__(parent)
+        self.report_path = report_path
+        self.profile = profile
+        self.heartbeat_ms = heartbeat_ms
+        self.stall_ms = stall_ms
+
+        self._lock = threading.Lock()
+        self._write_lock = threading.Lock()
+        self._started_at = time.monotonic()
+        self._last_beat = time.monotonic()
+        self._latencies = deque(maxlen=100_000)
+        self._stalls: List[Dict] = []
+        self._slot_stack: List[str] = []
+        self._slot_stats: Dict[str, List[float]] = {}   # name -> [calls, total_s, max_s]
+        self._pending_stacks: Optional[List[Tuple[str, str]]] = None   # (thread label, stack)
+        self._pending_slots: List[str] = []
+        self._hang_reported = False
+        self._profiles: List = []
+        self._process_profiler: Optional[cProfile.Profile] = None
+        self._profiler_error: Optional[str] = None
+        self._gui_thread_id = threading.get_ident()
+        self._watchdog_stop = threading.Event()
+        self._watchdog = threading.Thread(target=self._watch, name="diagnostics-watchdog", daemon=True)
+
+        self._heartbeat = QTimer(self)
+        self._heartbeat.setInterval(self.heartbeat_ms)
+        self._heartbeat.timeout.connect(self._on_heartbeat)
+        self._flush_timer = QTimer(self)
+        self._flush_timer.setInterval(30_000)
+        self._flush_timer.timeout.connect(lambda: self.write_report(final=False))
+
+    # ---------- lifecycle ----------
+    def start(self):
+        if self.profile and not tracemalloc.is_tracing():
+            tracemalloc.start(10)
+        if self.profile and PROCESS_WIDE_PROFILER:
+            prof = cProfile.Profile()
+            try:
+                prof.enable()
+                self._process_profiler = prof
+            except ValueError as e:
+                self._profiler_error = str(e)
+        self._last_beat = time.monotonic()
+        self._heartbeat.start()
+        self._flush_timer.start()
+        self._watchdog.start()
+
+    def stop(self):
+        self._heartbeat.stop()
+        self._flush_timer.stop()
+        self._watchdog_stop.set()
+        if self._process_profiler is not None:
+            self._process_profiler.disable()
+            with self._lock:
+                self._profiles.append(("all threads", self._process_profiler))
+            self._process_profiler = None
+        self.write_report(final=True)
+        if self.profile and tracemalloc.is_tracing():
+            tracemalloc.stop()
+
+    # ---------- instrumentation ----------
+    def instrument(self, cls, names: List[str]):
+        """Wrap cls's methods so their calls are counted, timed and named in stall records.
+
+        Must run before instances are created, since signal connections keep the
+        bound method they were given.
+        """
+        for name in names:
+            method = getattr(cls, name, None)
+            if method is not None:
+                setattr(cls, name, self._wrap_slot(f"{cls.__name__}.{name}", method))
+
+    def _wrap_slot(self, label: str, method):
+        @functools.wraps(method)
+        def wrapper(*args, **kwargs):
+            self._slot_stack.append(label)
+            t0 = time.perf_counter()
+            try:
+                return method(*args, **kwargs)
+            finally:
+                dt = time.perf_counter() - t0
+                self._slot_stack.pop()
+                stats = self._slot_stats.setdefault(label, [0, 0.0, 0.0])
+                stats[0] += 1
+                stats[1] += dt
+                stats[2] = max(stats[2], dt)
+        return wrapper
+
+    def profile_threads(self, classes):
+        """Run each QThread subclass's run() under its own cProfile profiler.
+
+        Only before Python 3.12; from 3.12 start() runs one profiler for all threads.
+        """
+        if not self.profile or PROCESS_WIDE_PROFILER:
+            return
+        for cls in classes:
+            original = cls.run
+            if getattr(original, "_diag_profiled", False):
+                continue
+
+            def run(thread, _original=original):
+                prof = cProfile.Profile()
+                prof.enable()
+                try:
+                    _original(thread)
+                finally:
+                    prof.disable()
+                    with self._lock:
+                        self._profiles.append((type(thread).__name__, prof))
+            run._diag_profiled = True
+            cls.run = run
+
+    # ---------- measurement ----------
+    def _on_heartbeat(self):
+        now = time.monotonic()
+        latency_ms = max(0.0, (now - self._last_beat) * 1000 - self.heartbeat_ms)
+        self._last_beat = now
+        self._latencies.append(latency_ms)
+        if latency_ms >= self.stall_ms:
+            with self._lock:
+                self._stalls.append({
+                    "at": datetime.now().strftime("%H:%M:%S"),
+                    "latency_ms": latency_ms,
+                    "slots": self._pending_slots or ["<untracked>"],
+                    "threads": self._pending_stacks,
+                })
+        self._pending_stacks = None
+        self._pending_slots = []
+        self._hang_reported = False
+
+    def _watch(self):
+        period = max(self.stall_ms / 4000, 0.02)
+        while not self._watchdog_stop.wait(period):
+            overdue = time.monotonic() - self._last_beat - self.heartbeat_ms / 1000
+            if overdue * 1000 < self.stall_ms:
+                continue
+            if self._pending_stacks is None:
+                self._pending_slots = list(self._slot_stack)
+                self._pending_stacks = self._thread_stacks()
+            if overdue >= DIAG_HANG_SECONDS and not self._hang_reported:
+                self._hang_reported = True
+                with self._lock:
+                    self._stalls.append({
+                        "at": datetime.now().strftime("%H:%M:%S"),
+                        "latency_ms": overdue * 1000,
+                        "slots": self._pending_slots or ["<untracked>"],
+                        "threads": self._pending_stacks,
+                        "hang": True,
+                    })
+                self.write_report(final=False)
+
+    def _thread_stacks(self) -> List[Tuple[str, str]]:
+        """Stacks of every thread except the watchdog, GUI thread first."""
+        names = {t.ident: t.name for t in threading.enumerate()}
+        own = threading.get_ident()
+        stacks = []
+        for ident, frame in sys._current_frames().items():
+            if ident == own:
+                continue
+            if ident == self._gui_thread_id:
+                label = "GUI thread"
+            elif ident in names:
+                label = names[ident]
+            else:
+                # QThreads are unknown to threading; name them after the object whose run() is outermost
+                outer = frame
+                while outer.f_back is not None:
+                    outer = outer.f_back
+                owner = None
+                if outer.f_code.co_name == "run":   # QThread.run, or the profile_threads wrapper
+                    owner = outer.f_locals.get("self") or outer.f_locals.get("thread")
+                label = type(owner).__name__ if owner is not None else "thread"
+            stacks.append((f"{label} ({ident})", "".join(traceback.format_stack(frame))))
+        stacks.sort(key=lambda s: not s[0].startswith("GUI thread"))
+        return stacks
+
+    # ---------- reporting ----------
+    def _latency_summary(self) -> List[str]:
+        samples = sorted(self._latencies)
+        if not samples:
+            return ["  no heartbeat samples"]
+
+        def pct(p):
+            return samples[min(len(samples) - 1, int(len(samples) * p))]
+        mean = sum(samples) / len(samples)
+        return [
+            f"  samples: {len(samples)}  mean: {mean:.1f} ms  p50: {pct(0.50):.1f} ms  "
+            f"p95: {pct(0.95):.1f} ms  p99: {pct(0.99):.1f} ms  max: {samples[-1]:.1f} ms",
+        ]
+
+    def write_report(self, final: bool = False):
+        with self._lock:
+            stalls = list(self._stalls)
+            profiles = list(self._profiles)
+        uptime = time.monotonic() - self._started_at
+        lines = [
+            f"YouTubeDownloader diagnostics — {datetime.now().isoformat(timespec='seconds')}",
+            f"uptime: {uptime:.0f}s  heartbeat: {self.heartbeat_ms} ms  stall threshold: {self.stall_ms} ms"
+            f"  final: {final}",
+            "",
+            "Event-loop latency",
+        ]
+        lines += self._latency_summary()
+
+        lines += ["", "Slots (calls, total, mean, max)"]
+        for label, (calls, total, worst) in sorted(list(self._slot_stats.items()), key=lambda kv: -kv[1][1]):
+            rate = calls / uptime if uptime else 0
+            lines.append(f"  {label:<40} {int(calls):>7} calls ({rate:.1f}/s)  {total * 1000:>9.1f} ms  "
+                         f"{total / calls * 1000 if calls else 0:>7.2f} ms  {worst * 1000:>8.1f} ms")
+
+        lines += ["", f"Stalls ({len(stalls)})"]
+        for s in stalls:
+            kind = "HANG (still blocked)" if s.get("hang") else "stall"
+            lines.append(f"  [{s['at']}] {kind} {s['latency_ms']:.0f} ms in {' > '.join(s['slots'])}")
+            for label, stack in s.get("threads") or []:
+                lines.append(f"    -- {label} --")
+                lines += ["    " + ln for ln in stack.rstrip().splitlines()]
+
+        if final and self.profile:
+            if PROCESS_WIDE_PROFILER:
+                lines += ["", "Profile (all threads: Python 3.12+ cannot profile threads separately)"]
+                if self._profiler_error:
+                    lines.append(f"  not profiled: {self._profiler_error}")
+            else:
+                lines += ["", f"Worker profiles ({len(profiles)} thread runs)"]
+            by_cls: Dict[str, List] = {}
+            for name, prof in profiles:
+                by_cls.setdefault(name, []).append(prof)
+            for name, profs in by_cls.items():
+                buf = io.StringIO()
+                stats = pstats.Stats(profs[0], stream=buf)
+                for p in profs[1:]:
+                    stats.add(p)
+                stats.sort_stats("cumulative").print_stats(30)
+                lines += ["", f"== {name} ({len(profs)} runs) ==", buf.getvalue()]
+            if tracemalloc.is_tracing():
+                current, peak = tracemalloc.get_traced_memory()
+                lines += ["", f"tracemalloc (all threads): current {current / 1e6:.1f} MB, peak {peak / 1e6:.1f} MB"]
+                snapshot = tracemalloc.take_snapshot().filter_traces([
+                    tracemalloc.Filter(False, tracemalloc.__file__),
+                ])
+                for stat in snapshot.statistics("lineno")[:25]:
+                    lines.append(f"  {stat}")
+
+        folder = os.path.dirname(self.report_path)
+        try:
+            if folder:
+                os.makedirs(folder, exist_ok=True)
+            tmp = self.report_path + ".part"
+            with self._write_lock:
+                with open(tmp, "w", encoding="utf-8") as f:
+                    f.write("\n".join(lines) + "\n")
+                os.replace(tmp, self.report_path)
+        except OSError as e:
+            print(f"Could not write diagnostics report {self.report_path}: {e}", file=sys.stderr)
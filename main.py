@@ -1,20 +1,61 @@
 from __future__ import annotations
+import argparse
 import os
 import sys
-from PySide6.QtGui import QGuiApplication, QFont, QIcon
-from PySide6.QtWidgets import QApplication
 
-try:
-    QGuiApplication.setHighDpiScaleFactorRoundingPolicy(
-        QGuiApplication.HighDpiScaleFactorRoundingPolicy.PassThrough
-    )
-except Exception:
-    pass
+# only what the IPC handoff needs is imported here; a forwarding launch exits before
+# QtGui, QtWidgets, diagnostics, the UI or yt-dlp are loaded
+from single_instance import InstanceServer, read_url_file, send_to_running
+from utils import APP_LOGO_PATH, BG, TEXT_HIGH, looks_like_url
 
-from ui import UXWindow
-from utils import APP_LOGO_PATH, BG, TEXT_HIGH
+def parse_args(argv):
+    parser = argparse.ArgumentParser(prog="YouTubeDownloader")
+    parser.add_argument("urls", nargs="*", help="links to add to the queue")
+    parser.add_argument("-f", "--file", action="append", default=[],
+                        help="text file with one link per line (may be repeated)")
+    parser.add_argument("--new-instance", action="store_true",
+                        help="do not hand links to an already running window")
+    parser.add_argument("--diagnostics", action="store_true",
+                        help="record event-loop stalls (or set YTD_DIAGNOSTICS=1)")
+    parser.add_argument("--profile", action="store_true",
+                        help="diagnostics plus cProfile of worker threads and tracemalloc (or set YTD_PROFILE=1)")
+    parser.add_argument("--diagnostics-report", metavar="PATH",
+                        help="where to write the diagnostics report (or set YTD_DIAGNOSTICS_REPORT)")
+    # Qt consumes its own flags (e.g. -style fusion); unknown flags are ignored here and
+    # their values, which land in the positionals, are dropped by collect_urls
+    args, _ = parser.parse_known_args(argv)
+    return args
+
+def collect_urls(args) -> list:
+    urls = [u.strip() for u in args.urls if looks_like_url(u)]
+    for path in args.file:
+        try:
+            urls.extend(read_url_file(path))
+        except OSError as e:
+            print(f"Could not read {path}: {e}", file=sys.stderr)
+    return urls
 
 def main():
+    args = parse_args(sys.argv[1:])
+    urls = collect_urls(args)
+
+    if not args.new_instance and send_to_running(urls):
+        sys.exit(0)
+    run_primary(args, urls)
+
+def run_primary(args, urls: list):
+    from PySide6.QtGui import QGuiApplication, QFont, QIcon
+    from PySide6.QtWidgets import QApplication
+    try:
+        QGuiApplication.setHighDpiScaleFactorRoundingPolicy(
+            QGuiApplication.HighDpiScaleFactorRoundingPolicy.PassThrough
+        )
+    except Exception:
+        pass
+
+    from diagnostics import DiagnosticsMonitor, default_report_path, env_flag
+    from ui import UXWindow
+
     app = QApplication(sys.argv)
     if APP_LOGO_PATH and isinstance(APP_LOGO_PATH, str):
         try:
@@ -30,6 +71,19 @@ def main():
     """)
     app.setFont(QFont("Segoe UI" if sys.platform.startswith("win") else "Sans Serif", 10))
 
+    monitor = None
+    profile = args.profile or env_flag("YTD_PROFILE")
+    if args.diagnostics or profile or env_flag("YTD_DIAGNOSTICS"):
+        from workers import DownloadWorker, TitleFetcher, ThumbnailLoader
+        report_path = args.diagnostics_report or os.environ.get("YTD_DIAGNOSTICS_REPORT") or default_report_path()
+        monitor = DiagnosticsMonitor(report_path, profile=profile, parent=app)
+        monitor.instrument(UXWindow, ["_append_log", "_render_logs", "_on_progress", "_on_wait_tick",
+                                      "_on_title_fetched", "_on_meta_fetched", "_load_visible_thumbnails",
+                                      "_on_thumbnail_ready", "_refresh_schedule", "_on_finished"])
+        monitor.profile_threads([DownloadWorker, TitleFetcher, ThumbnailLoader])
+        app.aboutToQuit.connect(monitor.stop)
+        print(f"Diagnostics enabled; report: {os.path.abspath(report_path)}", file=sys.stderr)
+
     w = UXWindow()
     try:
         if os.path.exists(APP_LOGO_PATH):
@@ -37,7 +91,20 @@ def main():
     except Exception:
         pass
 
+    server = None
+    if not args.new_instance:
+        server = InstanceServer(app)
+        server.urls_received.connect(lambda received: w.enqueue_urls(received) if received else None)
+        server.urls_received.connect(lambda _: w.bring_to_front())
+        if not server.listen():
+            server = None
+    app.aboutToQuit.connect(lambda: server.close() if server else None)
+
+    if monitor:
+        monitor.start()
     w.show()
+    if urls:
+        w.enqueue_urls(urls)
     sys.exit(app.exec())
 
 if __name__ == "__main__":
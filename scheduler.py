@@ -0,0 +1,51 @@
+from __future__ import annotations
+from typing import Dict, List, Optional
+
+POLICY_FIFO = "fifo"
+POLICY_PRIORITY = "priority"
+POLICY_SHORTEST = "shortest"
+
+POLICIES = [
+    (POLICY_FIFO, "Queue order"),
+    (POLICY_PRIORITY, "Priority"),
+    (POLICY_SHORTEST, "Shortest first"),
+]
+
+# used to compare items that only report a duration against items with a known size (~4 Mbit/s)
+NOMINAL_BYTES_PER_SECOND = 500_000
+
+def estimate_filesize(info: dict) -> Optional[int]:
+    """Best-effort size in bytes of the selected formats, from yt-dlp metadata."""
+    size = info.get("filesize") or info.get("filesize_approx")
+    if size:
+        return int(size)
+    parts = info.get("requested_formats") or []
+    total = 0
+    for f in parts:
+        part = f.get("filesize") or f.get("filesize_approx")
+        if not part:
+            return None
+        total += part
+    return int(total) if total else None
+
+def job_cost(entry: Dict) -> float:
+    """Estimated cost of an entry for shortest-first ordering; unknown jobs sort last."""
+    if entry.get("filesize"):
+        return float(entry["filesize"])
+    if entry.get("duration"):
+        return float(entry["duration"]) * NOMINAL_BYTES_PER_SECOND
+    return float("inf")
+
+def order_urls(entries: List[Dict], policy: str) -> List[str]:
+    """Return entry URLs in the order a worker should download them.
+
+    entries are queue item data dicts in their current (user-arranged) order,
+    which is also the tie-breaker for every policy. Shortest-first still honours
+    user priority first, then estimated cost.
+    """
+    indexed = list(enumerate(entries))
+    if policy == POLICY_PRIORITY:
+        indexed.sort(key=lambda p: (-int(p[1].get("priority") or 0), p[0]))
+    elif policy == POLICY_SHORTEST:
+        indexed.sort(key=lambda p: (-int(p[1].get("priority") or 0), job_cost(p[1]), p[0]))
+    return [e["url"] for _, e in indexed]
@@ -0,0 +1,116 @@
+from __future__ import annotations
+import getpass
+import os
+import sys
+from typing import List, Optional
+
+from PySide6.QtCore import QObject, QStandardPaths, Signal
+from PySide6.QtNetwork import QLocalServer, QLocalSocket
+
+from utils import looks_like_url
+
+CONNECT_TIMEOUT_MS = 150
+WRITE_TIMEOUT_MS = 1000
+
+def _server_name() -> str:
+    """Named pipe on Windows; elsewhere a socket path inside a per-user private folder.
+
+    A bare name would become /tmp/<name> on Unix, which another local user could
+    create first and so receive this user's links.
+    """
+    if sys.platform.startswith("win"):
+        try:
+            user = getpass.getuser()
+        except Exception:
+            user = "user"
+        return f"YouTubeDownloader-{user}"
+    folder = (os.environ.get("XDG_RUNTIME_DIR")
+              or QStandardPaths.writableLocation(QStandardPaths.RuntimeLocation)
+              or os.path.join(os.path.expanduser("~"), ".cache", "YouTubeDownloader"))
+    try:
+        os.makedirs(folder, mode=0o700, exist_ok=True)
+    except OSError:
+        pass
+    return os.path.join(folder, "YouTubeDownloader.sock")
+
+SERVER_NAME = _server_name()
+
+def read_url_file(path: str) -> List[str]:
+    """Read URLs from a text file: one per line; blank lines, '#' comments and non-links skipped."""
+    with open(path, "r", encoding="utf-8") as f:
+        return [ln.strip() for ln in f if looks_like_url(ln)]
+
+def _connect() -> Optional[QLocalSocket]:
+    sock = QLocalSocket()
+    sock.connectToServer(SERVER_NAME)
+    if not sock.waitForConnected(CONNECT_TIMEOUT_MS):
+        return None
+    return sock
+
+def send_to_running(urls: List[str]) -> bool:
+    """Hand urls to an already running instance. Returns False if none is listening.
+
+    Works without a QApplication so a second launch can exit before any GUI setup.
+    An empty list still connects, which asks the running window to come to the front.
+    """
+    sock = _connect()
+    if sock is None:
+        return False
+    if urls:
+        sock.write("\n".join(urls).encode("utf-8"))
+        sock.flush()
+    # waitForBytesWritten() is False when nothing is pending, so only wait while data is buffered
+    while sock.bytesToWrite() > 0:
+        if not sock.waitForBytesWritten(WRITE_TIMEOUT_MS):
+            break
+    ok = sock.bytesToWrite() == 0
+    sock.disconnectFromServer()
+    if sock.state() != QLocalSocket.UnconnectedState:
+        sock.waitForDisconnected(WRITE_TIMEOUT_MS)
+    return ok
+
+class InstanceServer(QObject):
+    """Local server owned by the primary instance; emits URLs forwarded by later launches."""
+    urls_received = Signal(list)    # urls (may be empty: just activate the window)
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._server = QLocalServer(self)
+        self._server.setSocketOptions(QLocalServer.UserAccessOption)
+        self._server.newConnection.connect(self._on_new_connection)
+        self._buffers = {}
+
+    def listen(self) -> bool:
+        if self._server.listen(SERVER_NAME):
+            return True
+        live = _connect()
+        if live is not None:
+            # another instance is serving this name; never take it over
+            live.disconnectFromServer()
+            return False
+        # a crashed instance can leave a stale socket behind; nobody answered, so reclaim it
+        QLocalServer.removeServer(SERVER_NAME)
+        return self._server.listen(SERVER_NAME)
+
+    def close(self):
+        self._server.close()
+
+    def _on_new_connection(self):
+        while self._server.hasPendingConnections():
+            conn = self._server.nextPendingConnection()
+            self._buffers[conn] = bytearray()
+            conn.readyRead.connect(lambda c=conn: self._on_ready_read(c))
+            conn.disconnected.connect(lambda c=conn: self._on_disconnected(c))
+
+    def _on_ready_read(self, conn: QLocalSocket):
+        buf = self._buffers.get(conn)
+        if buf is not None:
+            buf.extend(bytes(conn.readAll()))
+
+    def _on_disconnected(self, conn: QLocalSocket):
+        buf = self._buffers.pop(conn, bytearray())
+        buf.extend(bytes(conn.readAll()))
+        conn.deleteLater()
+        text = buf.decode("utf-8", errors="replace")
+        urls = [ln.strip() for ln in text.splitlines() if looks_like_url(ln)]
+        self.urls_received.emit(urls)
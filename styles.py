@@ -26,6 +26,22 @@ def list_style():
         QListWidget::item:selected {{ background: rgba(46,135,255,0.12); }}
     """
 
+def combo_style():
+    return f"""
+        QComboBox {{
+            background: transparent;
+            color: {TEXT_HIGH};
+            border: 1px solid {BORDER};
+            border-radius: 6px;
+            padding: 6px 10px;
+        }}
+        QComboBox QAbstractItemView {{
+            background: {CARD};
+            color: {TEXT_HIGH};
+            selection-background-color: rgba(46,135,255,0.12);
+        }}
+    """
+
 def log_style():
     return f"""
         QTextEdit {{
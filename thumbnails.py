@@ -0,0 +1,78 @@
+from __future__ import annotations
+import hashlib
+import os
+from collections import OrderedDict
+from typing import Optional
+
+from PySide6.QtGui import QPixmap
+
+from utils import THUMB_CACHE_DIR, THUMB_DISK_MAX_FILES, THUMB_MEMORY_BYTES, THUMB_SIZE
+
+def pick_thumbnail(info: dict) -> Optional[str]:
+    """Pick the smallest thumbnail URL that still covers THUMB_SIZE, falling back to the default one."""
+    want_w, want_h = THUMB_SIZE
+    best = None
+    for t in info.get("thumbnails") or []:
+        url = t.get("url")
+        w, h = t.get("width"), t.get("height")
+        if not url or not w or not h or w < want_w or h < want_h:
+            continue
+        if best is None or w * h < best[0]:
+            best = (w * h, url)
+    if best:
+        return best[1]
+    return info.get("thumbnail")
+
+def disk_cache_path(thumb_url: str) -> str:
+    """Path of the downscaled on-disk copy for a thumbnail URL."""
+    digest = hashlib.sha1(thumb_url.encode("utf-8")).hexdigest()
+    return os.path.join(THUMB_CACHE_DIR, f"{digest}.jpg")
+
+def prune_disk_cache(max_files: int = THUMB_DISK_MAX_FILES):
+    """Drop the oldest cached thumbnails once the cache folder grows past max_files."""
+    try:
+        entries = [e for e in os.scandir(THUMB_CACHE_DIR) if e.is_file()]
+    except OSError:
+        return
+    if len(entries) <= max_files:
+        return
+    entries.sort(key=lambda e: e.stat().st_mtime)
+    for e in entries[:len(entries) - max_files]:
+        try:
+            os.remove(e.path)
+        except OSError:
+            pass
+
+class PixmapLRU:
+    """In-memory LRU of decoded thumbnails, bounded by approximate pixel memory."""
+
+    def __init__(self, max_bytes: int = THUMB_MEMORY_BYTES):
+        self.max_bytes = max_bytes
+        self._items: "OrderedDict[str, QPixmap]" = OrderedDict()
+        self._bytes = 0
+
+    @staticmethod
+    def _cost(pix: QPixmap) -> int:
+        return max(1, pix.width() * pix.height() * max(pix.depth(), 8) // 8)
+
+    def get(self, key: str) -> Optional[QPixmap]:
+        pix = self._items.get(key)
+        if pix is not None:
+            self._items.move_to_end(key)
+        return pix
+
+    def put(self, key: str, pix: QPixmap):
+        old = self._items.pop(key, None)
+        if old is not None:
+            self._bytes -= self._cost(old)
+        self._items[key] = pix
+        self._bytes += self._cost(pix)
+        while self._bytes > self.max_bytes and len(self._items) > 1:
+            _, evicted = self._items.popitem(last=False)
+            self._bytes -= self._cost(evicted)
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._items
+
+    def __len__(self) -> int:
+        return len(self._items)
@@ -4,14 +4,17 @@ from typing import List, Dict, Optional
 
 from PySide6.QtWidgets import (
     QWidget, QHBoxLayout, QVBoxLayout, QTextEdit, QPushButton,
-    QListWidget, QLabel, QProgressBar, QSizePolicy, QListWidgetItem
+    QListWidget, QLabel, QProgressBar, QSizePolicy, QListWidgetItem, QComboBox,
+    QAbstractItemView
 )
-from PySide6.QtGui import QFont, QTextCursor, QPixmap, QIcon, QDesktopServices
-from PySide6.QtCore import Qt, QTimer, QUrl, QSize
+from PySide6.QtGui import QFont, QTextCursor, QPixmap, QIcon, QDesktopServices, QColor, QImage
+from PySide6.QtCore import Qt, QTimer, QUrl, QSize, QPoint
 
-from workers import TitleFetcher, DownloadWorker
+from workers import TitleFetcher, DownloadWorker, ThumbnailLoader
+from thumbnails import PixmapLRU
+from scheduler import POLICIES, POLICY_FIFO, order_urls
 from utils import (ERROR_RED, LOGO_PATH, PROGRESS_BLUE, SUCCESS_GREEN, TEXT_HIGH, WARN_AMBER, timestamp, maybe_add_bundled_ffmpeg_to_path,
-                   PRIMARY_ACCENT, PRIMARY_ACCENT_DARK, PRIMARY_ACCENT_LIGHT, BORDER, MUTED)
+                   PRIMARY_ACCENT, PRIMARY_ACCENT_DARK, PRIMARY_ACCENT_LIGHT, BORDER, MUTED, CARD, THUMB_SIZE)
 import styles
 
 class UXWindow(QWidget):
@@ -147,16 +150,32 @@ class UXWindow(QWidget):
         self.queue = QListWidget()
         self.queue.setFixedHeight(170)
         self.queue.setStyleSheet(styles.list_style())
+        self.queue.setIconSize(QSize(*THUMB_SIZE))
+        self.queue.setUniformItemSizes(True)
+        self.queue.setSelectionMode(QAbstractItemView.ExtendedSelection)
+        self.queue.setDragDropMode(QAbstractItemView.InternalMove)
+        self.queue.setDefaultDropAction(Qt.MoveAction)
         right_layout.addWidget(self.queue)
 
         queue_controls = QHBoxLayout()
         self.btn_remove = QPushButton("Remove")
         self.btn_clear = QPushButton("Clear")
-        for b in (self.btn_remove, self.btn_clear):
+        self.btn_prio_up = QPushButton("Priority +")
+        self.btn_prio_down = QPushButton("Priority −")
+        for b in (self.btn_remove, self.btn_clear, self.btn_prio_up, self.btn_prio_down):
             b.setFixedHeight(34)
             b.setStyleSheet(styles.secondary_button_style(outline=True))
+        self.policy_combo = QComboBox()
+        self.policy_combo.setFixedHeight(34)
+        self.policy_combo.setStyleSheet(styles.combo_style())
+        self.policy_combo.setToolTip("Order in which queued items are downloaded")
+        for key, label in POLICIES:
+            self.policy_combo.addItem(label, key)
         queue_controls.addWidget(self.btn_remove)
         queue_controls.addWidget(self.btn_clear)
+        queue_controls.addWidget(self.btn_prio_up)
+        queue_controls.addWidget(self.btn_prio_down)
+        queue_controls.addWidget(self.policy_combo)
         right_layout.addLayout(queue_controls)
 
         log_label = QLabel("Activity Log")
@@ -214,6 +233,10 @@ class UXWindow(QWidget):
         self.btn_add.clicked.connect(self._add_from_input)
         self.btn_remove.clicked.connect(self._remove_selected)
         self.btn_clear.clicked.connect(self._clear_queue)
+        self.btn_prio_up.clicked.connect(lambda: self._bump_priority(1))
+        self.btn_prio_down.clicked.connect(lambda: self._bump_priority(-1))
+        self.policy_combo.currentIndexChanged.connect(self._on_policy_changed)
+        self.queue.itemSelectionChanged.connect(self._update_buttons_state)
         self.btn_download_selected.clicked.connect(self._download_selected)
         self.btn_download_all.clicked.connect(self._download_all)
         self.btn_stop.clicked.connect(self._stop_worker)
@@ -227,6 +250,35 @@ class UXWindow(QWidget):
         self._active_title_fetchers: List[TitleFetcher] = []
         self._log_entries: List[Dict[str, str]] = []
         self._wait_entry_index: Optional[int] = None
+        self._batch_urls: set = set()
+
+        # thumbnails: only rows in the viewport are loaded; decoded pixmaps live in a bounded LRU
+        placeholder = QPixmap(*THUMB_SIZE)
+        placeholder.fill(QColor(CARD))
+        self._thumb_placeholder = QIcon(placeholder)
+        self._thumb_cache = PixmapLRU()
+        self._thumb_failed: set = set()
+        self._thumb_shown_items: List[QListWidgetItem] = []
+        self._thumb_loader = ThumbnailLoader()
+        self._thumb_loader.thumbnail_ready.connect(self._on_thumbnail_ready)
+        self._thumb_loader.thumbnail_failed.connect(self._on_thumbnail_failed)
+        self._thumb_loader.start()
+        self._thumb_timer = QTimer(self)
+        self._thumb_timer.setSingleShot(True)
+        self._thumb_timer.setInterval(80)
+        self._thumb_timer.timeout.connect(self._load_visible_thumbnails)
+        self.queue.verticalScrollBar().valueChanged.connect(self._schedule_thumbnails)
+        self.queue.model().rowsInserted.connect(self._schedule_thumbnails)
+        self.queue.model().rowsRemoved.connect(self._schedule_thumbnails)
+
+        # keep a running worker's remaining order in sync with the queue (coalesced like thumbnails)
+        self._schedule_timer = QTimer(self)
+        self._schedule_timer.setSingleShot(True)
+        self._schedule_timer.setInterval(50)
+        self._schedule_timer.timeout.connect(self._refresh_schedule)
+        self.queue.model().rowsMoved.connect(self._schedule_refresh)
+        self.queue.model().rowsInserted.connect(self._schedule_refresh)
+        self.queue.model().rowsRemoved.connect(self._schedule_refresh)
 
         self._update_buttons_state()
 
@@ -249,20 +301,26 @@ class UXWindow(QWidget):
             self._append_log("warn", "No links to add.")
             return
         raw_urls = [ln.strip() for ln in text.splitlines() if ln.strip()]
+        self.input.clear()
+        self.enqueue_urls(raw_urls)
+
+    def enqueue_urls(self, raw_urls: List[str]):
+        """Add URLs to the queue (skipping duplicates) and start fetching their titles."""
         added = 0
         urls_to_fetch = []
         for url in raw_urls:
             if not self._in_queue_url(url):
-                item = QListWidgetItem(url)
-                item.setData(Qt.UserRole, {"url": url, "title": None, "id": None})
+                item = QListWidgetItem(self._thumb_placeholder, url)
+                item.setData(Qt.UserRole, {"url": url, "title": None, "id": None, "thumbnail": None,
+                                            "duration": None, "filesize": None, "priority": 0})
                 self.queue.addItem(item)
                 added += 1
                 urls_to_fetch.append(url)
-        self.input.clear()
         if added:
             self._append_log("info", f"Added {added} link(s) to queue; fetching titles…")
             fetcher = TitleFetcher(urls_to_fetch)
             fetcher.title_fetched.connect(self._on_title_fetched)
+            fetcher.meta_fetched.connect(self._on_meta_fetched)
             fetcher.fetch_error.connect(self._on_title_fetch_error)
             fetcher.finished_batch.connect(lambda: self._cleanup_fetcher(fetcher))
             self._active_title_fetchers.append(fetcher)
@@ -272,16 +330,24 @@ class UXWindow(QWidget):
         self._update_buttons_state()
 
     def _on_title_fetched(self, url: str, title: str, vid: str):
-        for i in range(self.queue.count()):
-            item = self.queue.item(i)
-            data = item.data(Qt.UserRole)
-            if data and data.get("url") == url:
-                display = f"{title} — {vid}" if vid else title
-                item.setText(display)
-                newdata = {"url": url, "title": title, "id": vid}
-                item.setData(Qt.UserRole, newdata)
-                self._append_log("info", f"Title fetched: {title}")
-                return
+        item = self._find_item(url)
+        if item is None:
+            return
+        newdata = dict(item.data(Qt.UserRole) or {})
+        newdata.update({"url": url, "title": title, "id": vid})
+        item.setData(Qt.UserRole, newdata)
+        item.setText(self._item_display(newdata))
+        self._append_log("info", f"Title fetched: {title}")
+
+    def _on_meta_fetched(self, url: str, meta: dict):
+        item = self._find_item(url)
+        if item is None:
+            return
+        newdata = dict(item.data(Qt.UserRole) or {})
+        newdata.update(meta)
+        item.setData(Qt.UserRole, newdata)
+        self._schedule_thumbnails()
+        self._schedule_refresh()
 
     def _on_title_fetch_error(self, url: str, err: str):
         self._append_log("warn", f"Failed fetching title for {url}: {err}")
@@ -304,6 +370,26 @@ class UXWindow(QWidget):
         self._append_log("info", "Cleared queue.")
         self._update_buttons_state()
 
+    @staticmethod
+    def _item_display(data: dict) -> str:
+        title, vid = data.get("title"), data.get("id")
+        if title:
+            display = f"{title} — {vid}" if vid else title
+        else:
+            display = data.get("url", "")
+        prio = int(data.get("priority") or 0)
+        if prio:
+            display = f"[P{prio:+d}] {display}"
+        return display
+
+    def _find_item(self, url: str) -> Optional[QListWidgetItem]:
+        for i in range(self.queue.count()):
+            item = self.queue.item(i)
+            data = item.data(Qt.UserRole)
+            if data and data.get("url") == url:
+                return item
+        return None
+
     def _in_queue_url(self, url: str) -> bool:
         for i in range(self.queue.count()):
             item = self.queue.item(i)
@@ -314,6 +400,101 @@ class UXWindow(QWidget):
                 return True
         return False
 
+    # ---------- scheduling ----------
+    def _current_policy(self) -> str:
+        return self.policy_combo.currentData() or POLICY_FIFO
+
+    def _scheduled_urls(self, urls) -> List[str]:
+        wanted = set(urls)
+        entries = []
+        for i in range(self.queue.count()):
+            data = self.queue.item(i).data(Qt.UserRole)
+            if data and data.get("url") in wanted:
+                entries.append(data)
+        return order_urls(entries, self._current_policy())
+
+    def _schedule_refresh(self, *args):
+        if self.worker and self.worker.isRunning():
+            self._schedule_timer.start()
+
+    def _refresh_schedule(self, *args):
+        if self.worker and self.worker.isRunning():
+            self.worker.set_pending(self._scheduled_urls(self._batch_urls))
+
+    def _on_policy_changed(self, index: int):
+        self._append_log("info", f"Scheduling policy: {self.policy_combo.itemText(index)}")
+        self._refresh_schedule()
+
+    def _bump_priority(self, delta: int):
+        selected = self.queue.selectedItems()
+        if not selected:
+            self._append_log("warn", "No items selected.")
+            return
+        for item in selected:
+            data = dict(item.data(Qt.UserRole) or {})
+            data["priority"] = int(data.get("priority") or 0) + delta
+            item.setData(Qt.UserRole, data)
+            item.setText(self._item_display(data))
+        if self._current_policy() == POLICY_FIFO:
+            self._append_log("info", "Priority only affects the Priority and Shortest first policies.")
+        self._refresh_schedule()
+
+    # ---------- thumbnails ----------
+    def _schedule_thumbnails(self, *args):
+        self._thumb_timer.start()
+
+    def _visible_rows(self) -> range:
+        count = self.queue.count()
+        if count == 0:
+            return range(0)
+        viewport = self.queue.viewport()
+        first = self.queue.indexAt(QPoint(1, 1)).row()
+        last = self.queue.indexAt(QPoint(1, viewport.height() - 2)).row()
+        first = max(first, 0)
+        last = count - 1 if last < 0 else last
+        return range(first, last + 1)
+
+    def _load_visible_thumbnails(self):
+        visible_items = [self.queue.item(row) for row in self._visible_rows()]
+        visible_ids = {id(item) for item in visible_items}
+        # release pixmaps of items that scrolled out, moved or were removed so only the LRU keeps them alive
+        for item in self._thumb_shown_items:
+            if id(item) not in visible_ids:
+                try:
+                    item.setIcon(self._thumb_placeholder)
+                except RuntimeError:
+                    pass    # item was deleted by clear()
+        shown = []
+        wanted = []
+        for item in visible_items:
+            data = item.data(Qt.UserRole) or {}
+            thumb_url = data.get("thumbnail")
+            if not thumb_url or thumb_url in self._thumb_failed:
+                continue
+            pix = self._thumb_cache.get(thumb_url)
+            if pix is not None:
+                item.setIcon(QIcon(pix))
+                shown.append(item)
+            else:
+                wanted.append(thumb_url)
+        self._thumb_shown_items = shown
+        self._thumb_loader.request(wanted)
+
+    def _on_thumbnail_ready(self, thumb_url: str, image: QImage):
+        pix = QPixmap.fromImage(image)
+        self._thumb_cache.put(thumb_url, pix)
+        for row in self._visible_rows():
+            item = self.queue.item(row)
+            data = item.data(Qt.UserRole) or {}
+            if data.get("thumbnail") == thumb_url:
+                item.setIcon(QIcon(pix))
+                self._thumb_shown_items.append(item)
+
+    def _on_thumbnail_failed(self, thumb_url: str, permanent: bool):
+        # transient errors (timeouts, connection resets) are retried on a later viewport pass
+        if permanent:
+            self._thumb_failed.add(thumb_url)
+
     # ---------- download orchestration ----------
     def _download_selected(self):
         selected = self.queue.selectedItems()
@@ -340,7 +521,8 @@ class UXWindow(QWidget):
         self.current_item_label.setText("")
         self._progress_anim_state = False
         self._progress_anim_timer.start()
-        self.worker = DownloadWorker(urls)
+        self._batch_urls = set(urls)
+        self.worker = DownloadWorker(self._scheduled_urls(urls))
         self.worker.progress.connect(self._on_progress)
         self.worker.info.connect(lambda s: self._append_log("info", s))
         self.worker.warn.connect(lambda s: self._append_log("warn", s))
@@ -383,6 +565,7 @@ class UXWindow(QWidget):
         self.progress.setValue(0)
         self.current_item_label.setText("")
         self.worker = None
+        self._batch_urls = set()
         self._set_controls_enabled(True)
         self._update_buttons_state()
 
@@ -440,6 +623,18 @@ class UXWindow(QWidget):
         self.log.setHtml(html)
         self.log.moveCursor(QTextCursor.End)
 
+    def bring_to_front(self):
+        if self.isMinimized():
+            self.showNormal()
+        self.raise_()
+        self.activateWindow()
+
+    def closeEvent(self, event):
+        self._thumb_loader.stop()
+        # stop() abandons any in-flight fetch, so this only waits for a decode to finish
+        self._thumb_loader.wait()
+        super().closeEvent(event)
+
     # ---------- UI helpers ----------
     def _set_controls_enabled(self, enabled: bool):
         for w in (self.btn_add, self.btn_remove, self.btn_clear,
@@ -449,7 +644,13 @@ class UXWindow(QWidget):
 
     def _update_buttons_state(self):
         has_items = self.queue.count() > 0
+        has_selection = has_items and len(self.queue.selectedItems()) > 0
+        # priority stays editable during a batch; everything else is locked by _set_controls_enabled
+        self.btn_prio_up.setEnabled(has_selection)
+        self.btn_prio_down.setEnabled(has_selection)
+        if self.worker and self.worker.isRunning():
+            return
         self.btn_download_all.setEnabled(has_items)
-        self.btn_download_selected.setEnabled(has_items and len(self.queue.selectedItems()) > 0)
-        self.btn_remove.setEnabled(has_items and len(self.queue.selectedItems()) > 0)
+        self.btn_download_selected.setEnabled(has_selection)
+        self.btn_remove.setEnabled(has_selection)
         self.btn_clear.setEnabled(has_items)
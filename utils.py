@@ -1,5 +1,6 @@
 from __future__ import annotations
 import os
+import re
 import sys
 from datetime import datetime
 
@@ -20,9 +21,26 @@ OUTPUT_DIR = "downloads"
 RETRY_COUNT = 3
 RETRY_DELAY = 5
 
+DIAGNOSTICS_DIR = "diagnostics"
+DIAG_HEARTBEAT_MS = 50
+DIAG_STALL_MS = 200
+DIAG_HANG_SECONDS = 10
+
+THUMB_SIZE = (96, 54)
+THUMB_MEMORY_BYTES = 8 * 1024 * 1024
+THUMB_DISK_MAX_FILES = 2000
+THUMB_FETCH_TIMEOUT = 5
+THUMB_CACHE_DIR = os.path.join(os.path.expanduser("~"), ".cache", "YouTubeDownloader", "thumbnails")
+
 LOGO_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "assets", "logo.png")
 APP_LOGO_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "assets", "logoApp.png")
 
+URL_RE = re.compile(r"^(?:[a-zA-Z][\w+.-]*://|www\.)\S+$")
+
+def looks_like_url(text: str) -> bool:
+    """True for 'scheme://...' or 'www....' strings without whitespace."""
+    return bool(URL_RE.match(text.strip()))
+
 def timestamp() -> str:
     """Get the current time as a string in the format "HH:MM:SS"."""
     return datetime.now().strftime("%H:%M:%S")
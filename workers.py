@@ -1,17 +1,25 @@
 from __future__ import annotations
 import os
+import threading
 import time
-from typing import List
-from PySide6.QtCore import QThread, Signal
+import urllib.error
+import urllib.request
+from typing import List, Optional
+from PySide6.QtCore import QThread, Signal, Qt
+from PySide6.QtGui import QImage
 
 from yt_dlp import YoutubeDL
 from yt_dlp.utils import DownloadError
 
-from utils import OUTPUT_DIR, RETRY_COUNT, RETRY_DELAY, maybe_add_bundled_ffmpeg_to_path
+from utils import (OUTPUT_DIR, RETRY_COUNT, RETRY_DELAY, THUMB_CACHE_DIR, THUMB_FETCH_TIMEOUT, THUMB_SIZE,
+                   maybe_add_bundled_ffmpeg_to_path)
+from thumbnails import pick_thumbnail, disk_cache_path, prune_disk_cache
+from scheduler import estimate_filesize
 
 class TitleFetcher(QThread):
     """Fetches titles (metadata) for a list of URLs in the background."""
     title_fetched = Signal(str, str, str)   # url, title, id
+    meta_fetched = Signal(str, dict)        # url, {"thumbnail", "duration", "filesize"}
     fetch_error = Signal(str, str)          # url, error message
     finished_batch = Signal()
 
@@ -34,12 +42,125 @@ class TitleFetcher(QThread):
                 title = info.get("title") or info.get("id") or url
                 vid = info.get("id") or ""
                 self.title_fetched.emit(url, title, vid)
+                self.meta_fetched.emit(url, {
+                    "thumbnail": pick_thumbnail(info),
+                    "duration": info.get("duration"),
+                    "filesize": estimate_filesize(info),
+                })
             except Exception as e:
                 self.fetch_error.emit(url, str(e))
         self.finished_batch.emit()
 
+class ThumbnailLoader(QThread):
+    """Long-lived thread that fetches, downscales and disk-caches thumbnails on demand.
+
+    Network reads run on throwaway daemon threads, so stop() returns control
+    at once even if a DNS lookup or a slow response is still in progress.
+    """
+    thumbnail_ready = Signal(str, QImage)   # thumbnail url, downscaled image
+    thumbnail_failed = Signal(str, bool)    # thumbnail url, permanent (404 / undecodable)
+
+    def __init__(self):
+        super().__init__()
+        self._pending: List[str] = []
+        self._cond = threading.Condition()
+        self._fetch_done: Optional[threading.Event] = None
+        self._stop = False
+
+    def request(self, thumb_urls: List[str]):
+        """Replace the pending work with thumb_urls (the rows currently visible)."""
+        with self._cond:
+            self._pending = list(thumb_urls)
+            self._cond.notify()
+
+    def stop(self):
+        with self._cond:
+            self._stop = True
+            self._pending = []
+            if self._fetch_done is not None:
+                self._fetch_done.set()
+            self._cond.notify()
+
+    def run(self):
+        os.makedirs(THUMB_CACHE_DIR, exist_ok=True)
+        prune_disk_cache()
+        while True:
+            with self._cond:
+                while not self._pending and not self._stop:
+                    self._cond.wait()
+                if self._stop:
+                    return
+                thumb_url = self._pending.pop(0)
+            image, permanent = self._load(thumb_url)
+            if self._stop:
+                return
+            if image is None:
+                self.thumbnail_failed.emit(thumb_url, permanent)
+            else:
+                self.thumbnail_ready.emit(thumb_url, image)
+
+    def _load(self, thumb_url: str):
+        """Return (image, permanent_failure); image is None when loading failed."""
+        path = disk_cache_path(thumb_url)
+        if os.path.exists(path):
+            image = QImage(path)
+            if not image.isNull():
+                try:
+                    os.utime(path, None)
+                except OSError:
+                    pass
+                return image, False
+        data, permanent = self._fetch(thumb_url)
+        if data is None:
+            return None, permanent
+        image = QImage()
+        if not image.loadFromData(data):
+            return None, True
+        w, h = THUMB_SIZE
+        image = image.scaled(w, h, Qt.KeepAspectRatio, Qt.SmoothTransformation)
+        tmp = path + ".part"
+        try:
+            if image.save(tmp, "JPG", 85):
+                os.replace(tmp, path)
+        except OSError:
+            pass
+        return image, False
+
+    def _fetch(self, thumb_url: str):
+        """Download thumb_url on a daemon thread; returns (bytes or None, permanent_failure)."""
+        result = {"data": None, "permanent": False}
+        done = threading.Event()
+
+        def target():
+            try:
+                req = urllib.request.Request(thumb_url, headers={"User-Agent": "Mozilla/5.0"})
+                with urllib.request.urlopen(req, timeout=THUMB_FETCH_TIMEOUT) as resp:
+                    result["data"] = resp.read()
+            except urllib.error.HTTPError as e:
+                result["permanent"] = e.code in (404, 410)
+            except Exception:
+                pass
+            finally:
+                done.set()
+
+        with self._cond:
+            if self._stop:
+                return None, False
+            self._fetch_done = done
+        threading.Thread(target=target, name="thumbnail-fetch", daemon=True).start()
+        done.wait()    # set by the fetch or by stop()
+        with self._cond:
+            self._fetch_done = None
+            if self._stop:
+                return None, False
+        return result["data"], result["permanent"]
+
 class DownloadWorker(QThread):
-    """Downloads a list of URLs sequentially, emitting progress & events."""
+    """Downloads a list of URLs sequentially, emitting progress & events.
+
+    The remaining order can be replaced with set_pending() while running;
+    the next item is picked from the latest order.
+    """
     progress = Signal(int, str)          # percent, filename
     info = Signal(str)
     warn = Signal(str)
@@ -51,14 +172,32 @@ class DownloadWorker(QThread):
 
     def __init__(self, urls: List[str]):
         super().__init__()
-        self.urls = urls
+        self._pending: List[str] = list(urls)
+        self._started: set = set()
+        self._lock = threading.Lock()
         self._stop = False
 
+    def set_pending(self, urls: List[str]):
+        """Replace the order of the items not yet started."""
+        with self._lock:
+            self._pending = [u for u in urls if u not in self._started]
+
+    def _next_url(self) -> Optional[str]:
+        with self._lock:
+            if not self._pending:
+                return None
+            url = self._pending.pop(0)
+            self._started.add(url)
+            return url
+
     def run(self):
         maybe_add_bundled_ffmpeg_to_path()
         os.makedirs(OUTPUT_DIR, exist_ok=True)
         successes, failures = [], []
-        for url in self.urls:
+        while True:
+            url = self._next_url()
+            if url is None:
+                break
             if self._stop:
                 self.info.emit("Stop requested; ending worker.")
                 break